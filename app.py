@@ -4,15 +4,24 @@
 # Catapult-style dark theme + Planner + Expected Demand + Quick %MDP
 # -------------------------------------------------------------
 
-from typing import Optional, Dict
+from typing import Tuple
+import numpy as np
+import pandas as pd
 import streamlit as st
 from datetime import date
 
+from ssg_logic import expected_demand, pct_buckets, pct_styles
+
 # --------------------------- Page Setup ---------------------------
 st.set_page_config(page_title="SSG vs Match Demand", page_icon="⚽", layout="wide")
 
-# Display Catapult logo
-st.image("CAT_horizontal_logo_lockup_white.png", width=180)
+# Display Catapult logo (read from disk once per process)
+@st.cache_resource
+def load_logo() -> bytes:
+    with open("CAT_horizontal_logo_lockup_white.png", "rb") as f:
+        return f.read()
+
+st.image(load_logo(), width=180)
 
 # --------------------------- Global CSS ---------------------------
 st.markdown(
@@ -29,6 +38,10 @@ st.markdown(
       .ssg-chip { display:flex; flex-direction:column; align-items:center; justify-content:center; border-radius:12px; padding:10px 12px; min-height:68px; background:#020617; }
       .ssg-chip .t { font-size:11px; opacity:.7; color:#9ca3af; }
       .ssg-chip .v { font-weight:800; font-size:16px; color:#f9fafb; }
+      .ssg-grid { display:grid; grid-template-columns:repeat(6, 1fr); gap:16px; }
+      .ssg-grid.cols-5 { grid-template-columns:repeat(5, 1fr); }
+      .ssg-bar { height:6px; margin-top:8px; border-radius:4px; background:#111827; overflow:hidden; }
+      .ssg-bar .fill { height:100%; border-radius:4px; }
       .stTabs [role="tab"] { background:#020617; color:#9ca3af; border-radius:999px; padding:6px 16px; }
       .stTabs [role="tab"][aria-selected="true"] { background:#111827; color:#f9fafb; }
     </style>
@@ -46,30 +59,30 @@ DEFAULT_COLORS = {
     "over_text": "#FFEDD5",
 }
 
-def style_for_pct(v: Optional[float], colors: dict) -> str:
-    if v is None:
-        return "background:#111827;color:#6b7280;"
-    if v < 0.8:
-        return f"background:{colors['under']};color:#111827;"
-    if v <= 1.0:
-        return f"background:{colors['on']};color:#022c22;"
-    return f"background:{colors['over']};color:#7c2d12;"
-
-# --------------------------- Expected Demand Logic ---------------------------
-def expected_demand(app: Optional[float]) -> Dict[str, str]:
-    if not app:
-        return {k: "" for k in ["TD", "HSR", "SPRINT", "ACC", "DEC", "PL"]}
-
-    if app < 85:
-        return {"TD":"MED","HSR":"LOW","SPRINT":"LOW","ACC":"HIGH","DEC":"HIGH","PL":"HIGH"}
-    elif app <= 120:
-        return {"TD":"MED","HSR":"MED","SPRINT":"MED","ACC":"MED","DEC":"MED","PL":"MED"}
-    else:
-        return {"TD":"HIGH","HSR":"HIGH","SPRINT":"HIGH","ACC":"LOW","DEC":"LOW","PL":"LOW"}
+# --------------------------- Planner Logic ---------------------------
+def planner_totals(
+    length: int, width: int, players: int, sets: int, work: int, rest: int
+) -> Tuple[int, float, int, float, float]:
+    """Area, APP, work, rest and total time (min) for one SSG block."""
+    area = length * width
+    app = area / players
+    total_work = sets * work
+    total_rest = (sets * rest) / 60
+    return area, app, total_work, total_rest, total_work + total_rest
+
+# --------------------------- Quick %MDP Logic ---------------------------
+MDP_METRICS = ("TD", "HMLD", "ACC", "DEC", "HSR", "PL")
+MDP_DEFAULTS = pd.DataFrame(
+    {
+        "Match": [180.0, 30.0, 0.9, 0.8, 3.5, 12.0],
+        "SSG": [165.0, 28.0, 1.1, 1.0, 1.8, 13.0],
+    },
+    index=pd.Index(MDP_METRICS, name="Metric"),
+)
 
 def fmt_pct(v):
     if v is None: return "-"
-    return f"{v*100:.0f}%"
+    return "%.0f%%" % (v*100)
 
 # --------------------------- Sidebar ---------------------------
 with st.sidebar:
@@ -117,52 +130,48 @@ st.markdown(
 planner_tab, quick_tab = st.tabs(["🗺️ Planner", "⚡ Quick %MDP"])
 
 # ========================== PLANNER TAB ==========================
-with planner_tab:
+# Each tab body is a fragment, so its widgets only rerun that tab
+@st.fragment
+def planner_fragment() -> None:
     st.markdown("<div class='ssg-card ssg-shadow'>", unsafe_allow_html=True)
     st.subheader("Planner")
 
-    # Inputs
-    colA, colB, colC = st.columns(3)
-    with colA:
-        _date = st.date_input("Date", value=date.today())
-        format_ = st.selectbox("Format", ["4v4","6v6","7v7","8v8","10v10"])
-        players = st.number_input("Players", 2, 22, 8)
-    with colB:
-        length = st.number_input("Length (m)", 10, 120, 30)
-        width = st.number_input("Width (m)", 10, 90, 40)
-        sets = st.number_input("Sets", 1, 12, 3)
-    with colC:
-        work = st.number_input("Work per set (min)", 1, 30, 3)
-        rest = st.number_input("Rest (sec)", 15, 300, 90)
+    # Inputs (batched in a form so typing doesn't rerun per keystroke)
+    with st.form("planner_form"):
+        colA, colB, colC = st.columns(3)
+        with colA:
+            _date = st.date_input("Date", value=date.today())
+            format_ = st.selectbox("Format", ["4v4","6v6","7v7","8v8","10v10"])
+            players = st.number_input("Players", 2, 22, 8)
+        with colB:
+            length = st.number_input("Length (m)", 10, 120, 30)
+            width = st.number_input("Width (m)", 10, 90, 40)
+            sets = st.number_input("Sets", 1, 12, 3)
+        with colC:
+            work = st.number_input("Work per set (min)", 1, 30, 3)
+            rest = st.number_input("Rest (sec)", 15, 300, 90)
+
+        st.form_submit_button("Apply")
 
     # Calculations
-    area = length * width
-    app = area / players
-    total_work = sets * work
-    total_rest = (sets * rest) / 60
-    total_time = total_work + total_rest
+    area, app, total_work, total_rest, total_time = planner_totals(
+        length, width, players, sets, work, rest
+    )
 
     # KPIs
-    k1, k2, k3, k4, k5 = st.columns(5)
     labels = ["Area (m²)", "APP (m²)", "Work (min)", "Rest (min)", "Total (min)"]
     values = [f"{area:.0f}", f"{app:.0f}", f"{total_work:.0f}", f"{total_rest:.0f}", f"{total_time:.0f}"]
 
-    for col, label, val in zip([k1,k2,k3,k4,k5], labels, values):
-        col.markdown(
-            f"""
-            <div class='ssg-kpi'>
-              <div class='label'>{label}</div>
-              <div class='value'>{val}</div>
-            </div>
-            """,
-            unsafe_allow_html=True
-        )
+    kpis = "".join(
+        f"<div class='ssg-kpi'><div class='label'>{label}</div><div class='value'>{val}</div></div>"
+        for label, val in zip(labels, values)
+    )
+    st.markdown(f"<div class='ssg-grid cols-5'>{kpis}</div>", unsafe_allow_html=True)
 
     # Expected Demand
     st.markdown("### Expected Demand")
     exp = expected_demand(app)
 
-    t1,t2,t3,t4,t5,t6 = st.columns(6)
     tags = [
         ("TD",exp["TD"]),
         ("HSR",exp["HSR"]),
@@ -172,16 +181,11 @@ with planner_tab:
         ("PL",exp["PL"])
     ]
 
-    for (label,val),col in zip(tags,[t1,t2,t3,t4,t5,t6]):
-        col.markdown(
-            f"""
-            <div class='ssg-pill'>
-                <span class='l'>{label}</span>
-                <span class='r'>{val}</span>
-            </div>
-            """,
-            unsafe_allow_html=True
-        )
+    pills = "".join(
+        f"<div class='ssg-pill'><span class='l'>{label}</span><span class='r'>{val}</span></div>"
+        for label, val in tags
+    )
+    st.markdown(f"<div class='ssg-grid'>{pills}</div>", unsafe_allow_html=True)
 
     # Summary
     summary = (
@@ -193,58 +197,54 @@ with planner_tab:
 
     st.markdown("</div>", unsafe_allow_html=True)
 
+with planner_tab:
+    planner_fragment()
+
 # ========================== QUICK %MDP TAB ==========================
-with quick_tab:
+@st.fragment
+def quick_mdp_fragment(colors: dict) -> None:
     st.markdown("<div class='ssg-card ssg-shadow'>", unsafe_allow_html=True)
     st.subheader("Quick % of Match")
 
-    left, right = st.columns(2)
-    with left:
-        st.markdown("**Match MDP (per min)**")
-        mdp_td = st.number_input("TD/min", 0.0, 400.0, 180.0)
-        mdp_hmld = st.number_input("HMLD/min", 0.0, 100.0, 30.0)
-        mdp_acc = st.number_input("ACC/min", 0.0, 5.0, 0.9)
-        mdp_dec = st.number_input("DEC/min", 0.0, 5.0, 0.8)
-        mdp_hsr = st.number_input("HSR/min", 0.0, 20.0, 3.5)
-        mdp_pl = st.number_input("PL/min", 0.0, 30.0, 12.0)
-
-    with right:
-        st.markdown("**SSG Block (per min)**")
-        ssg_td = st.number_input("TD/min ", value=165.0)
-        ssg_hmld = st.number_input("HMLD/min ", value=28.0)
-        ssg_acc = st.number_input("ACC/min ", value=1.1)
-        ssg_dec = st.number_input("DEC/min ", value=1.0)
-        ssg_hsr = st.number_input("HSR/min ", value=1.8)
-        ssg_pl = st.number_input("PL/min ", value=13.0)
-
-    def pct(num, den):
-        try:
-            return num / den if den else None
-        except:
-            return None
+    # One editable grid for both profiles, batched in a form so edits only
+    # rerun on submit
+    with st.form("mdp_form"):
+        edited = st.data_editor(
+            MDP_DEFAULTS,
+            key="mdp_grid",
+            num_rows="fixed",
+            column_config={
+                "Match": st.column_config.NumberColumn("Match MDP (per min)", min_value=0.0, required=True),
+                "SSG": st.column_config.NumberColumn("SSG Block (per min)", required=True),
+            },
+        )
+        st.form_submit_button("Compute %MDP")
+
+    # One masked divide for all six ratios; a zero match value yields None
+    ssg = edited["SSG"].to_numpy(dtype=float)
+    mdp = edited["Match"].to_numpy(dtype=float)
+    ratios = np.divide(ssg, mdp, out=np.full_like(ssg, np.nan), where=mdp != 0)
 
     metrics = [
-        ("TD", pct(ssg_td, mdp_td)),
-        ("HMLD", pct(ssg_hmld, mdp_hmld)),
-        ("ACC", pct(ssg_acc, mdp_acc)),
-        ("DEC", pct(ssg_dec, mdp_dec)),
-        ("HSR", pct(ssg_hsr, mdp_hsr)),
-        ("PL", pct(ssg_pl, mdp_pl)),
+        (label, None if np.isnan(r) else r)
+        for label, r in zip(MDP_METRICS, ratios.tolist())
     ]
 
-    cols = st.columns(6)
-    for (label, val), col in zip(metrics, cols):
-        style = style_for_pct(val, colors)
-        col.markdown(
-            f"""
-            <div class='ssg-chip ssg-shadow' style="{style}">
-              <div class='t'>{label}</div>
-              <div class='v'>{fmt_pct(val)}</div>
-            </div>
-            """,
-            unsafe_allow_html=True,
-        )
-        col.progress(min(1.0, max(0.0, val if val else 0.0)))
+    styles = pct_styles(colors)
+    buckets = pct_buckets(ratios)
+
+    # Emit the whole chip row (with CSS progress bars) as a single element
+    chips = "".join(
+        f"<div><div class='ssg-chip ssg-shadow' style=\"{styles[bucket]}\">"
+        f"<div class='t'>{label}</div><div class='v'>{fmt_pct(val)}</div></div>"
+        f"<div class='ssg-bar'><div class='fill' style=\"width:{min(1.0, max(0.0, val or 0.0)) * 100:.0f}%;"
+        f"background:{colors['accent']};\"></div></div></div>"
+        for (label, val), bucket in zip(metrics, buckets.tolist())
+    )
+    st.markdown(f"<div class='ssg-grid'>{chips}</div>", unsafe_allow_html=True)
 
     st.caption("Legend: <80% Under · 80–100% On Target · >100% Overload")
     st.markdown("</div>", unsafe_allow_html=True)
+
+with quick_tab:
+    quick_mdp_fragment(colors)
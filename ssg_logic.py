@@ -0,0 +1,50 @@
+# ssg_logic.py
+# -------------------------------------------------------------
+# Pure helpers for app.py, kept out of the Streamlit script so module-level
+# state survives reruns (app.py itself is re-executed each time).
+# -------------------------------------------------------------
+
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Mapping, Optional, Tuple
+import numpy as np
+
+# --------------------------- Color Logic ---------------------------
+NULL_STYLE = "background:#111827;color:#6b7280;"
+
+@lru_cache(maxsize=64)
+def _band_styles(under: str, on: str, over: str) -> Tuple[str, str, str, str]:
+    return (
+        f"background:{under};color:#111827;",
+        f"background:{on};color:#022c22;",
+        f"background:{over};color:#7c2d12;",
+        NULL_STYLE,
+    )
+
+def pct_styles(colors: dict) -> Tuple[str, str, str, str]:
+    """Chip styles indexed by pct_buckets(): under, on, over, and -1 for missing."""
+    return _band_styles(colors["under"], colors["on"], colors["over"])
+
+def pct_buckets(ratios: np.ndarray) -> np.ndarray:
+    # <0.8 under (0), 0.8–1.0 on (1), >1.0 over (2); NaN maps to -1
+    buckets = (ratios >= 0.8).astype(np.int8) + (ratios > 1.0)
+    return np.where(np.isnan(ratios), -1, buckets)
+
+# --------------------------- Expected Demand Logic ---------------------------
+# The APP bands map to fixed profiles. Streamlit re-executes app.py on every
+# rerun, so they live in this imported module to be built once per process.
+DEMAND_EMPTY = MappingProxyType({k: "" for k in ["TD", "HSR", "SPRINT", "ACC", "DEC", "PL"]})
+DEMAND_SMALL = MappingProxyType({"TD":"MED","HSR":"LOW","SPRINT":"LOW","ACC":"HIGH","DEC":"HIGH","PL":"HIGH"})
+DEMAND_MEDIUM = MappingProxyType({"TD":"MED","HSR":"MED","SPRINT":"MED","ACC":"MED","DEC":"MED","PL":"MED"})
+DEMAND_LARGE = MappingProxyType({"TD":"HIGH","HSR":"HIGH","SPRINT":"HIGH","ACC":"LOW","DEC":"LOW","PL":"LOW"})
+
+def expected_demand(app: Optional[float]) -> Mapping[str, str]:
+    if not app:
+        return DEMAND_EMPTY
+
+    if app < 85:
+        return DEMAND_SMALL
+    elif app <= 120:
+        return DEMAND_MEDIUM
+    else:
+        return DEMAND_LARGE